@@ -4,8 +4,23 @@ import json
 import os
 import sys
 import argparse
+import functools
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from datetime import datetime
+from json.encoder import encode_basestring_ascii
 
+# Read buffer size for the input CSV
+CSV_BUFFER_SIZE = 1 << 20  # 1 MiB
+# Number of threads used to write JSON files concurrently
+WRITE_WORKERS = 32
+# Number of files handed to a writer thread in a single task
+WRITE_BATCH_SIZE = 64
+# Maximum number of batches queued for writing before the reader waits
+MAX_PENDING_BATCHES = WRITE_WORKERS * 2
+# Number of processed files between progress updates
+PROGRESS_INTERVAL = 1000
+
+@functools.lru_cache(maxsize=None)
 def parse_os_name(os_name):
     """
     Parse OS name into components for directory structure
@@ -34,91 +49,172 @@ def parse_os_name(os_name):
         
     return distro, version, variant
 
+def dump_entry(entry):
+    """
+    Serialize a CSV row to JSON, producing the same output as json.dumps(entry, indent=2)
+    Rows made only of strings are assembled directly, because indent=2 makes the
+    standard encoder fall back to its slow pure-Python implementation.
+    """
+    if not entry:
+        return json.dumps(entry, indent=2)
+    try:
+        # encode_basestring_ascii raises TypeError for anything but a string
+        fields = ",\n  ".join([f"{encode_basestring_ascii(k)}: {encode_basestring_ascii(v)}" for k, v in entry.items()])
+    except TypeError:
+        return json.dumps(entry, indent=2)
+    return "{\n  " + fields + "\n}"
+
 def convert_csv_to_json(csv_file_path):
     """
-    Read CVE data from CSV file and convert to list of dictionaries
+    Read CVE data from CSV file, yielding one dictionary per row
+    Rows are streamed so the whole CSV never has to be held in memory.
     """
+    count = 0
     try:
-        with open(csv_file_path, 'r', newline='', encoding='utf-8') as csv_file:
+        with open(csv_file_path, 'r', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as csv_file:
             reader = csv.DictReader(csv_file)
-            data = list(reader)
-            print(f"Successfully read {len(data)} entries from CSV file")
-            return data
+            for row in reader:
+                count += 1
+                yield row
+        print(f"Successfully read {count} entries from CSV file")
     except Exception as e:
         print(f"Error reading CSV file: {e}")
         sys.exit(1)
 
+def write_json_file(file_path, new_content):
+    """
+    Write JSON content to a file unless it already holds exactly that content
+    Returns True if the file was created/updated, False if it was unchanged.
+    """
+    # Check if file exists and compare content
+    try:
+        existing_size = os.stat(file_path).st_size
+    except FileNotFoundError:
+        existing_size = None
+    
+    # Only read the existing file if its size matches, otherwise it has changed
+    if existing_size == len(new_content):
+        try:
+            with open(file_path, 'rb') as f:
+                existing_content = f.read()
+                
+            # Skip if content is unchanged
+            if existing_content == new_content:
+                return False
+        except Exception as e:
+            # If reading fails, proceed with writing the file
+            print(f"Warning: Could not read existing file {file_path}: {e}")
+    
+    # Write the JSON file (only if new or content changed)
+    with open(file_path, 'wb') as f:
+        f.write(new_content)
+    return True
+
+def write_json_batch(batch):
+    """
+    Write a batch of (cve, file_path, content) JSON files
+    Returns the number of created/updated and unchanged files.
+    """
+    written = 0
+    unchanged = 0
+    for cve, file_path, new_content in batch:
+        try:
+            if write_json_file(file_path, new_content):
+                written += 1
+            else:
+                unchanged += 1
+        except Exception as e:
+            print(f"Error processing entry {cve}: {e}")
+    return written, unchanged
+
+def collect_write_batches(futures, file_count, unchanged_count):
+    """
+    Add the results of completed write batches to the running totals, printing progress
+    Returns the updated (file_count, unchanged_count).
+    """
+    for future in futures:
+        previous_total = file_count + unchanged_count
+        written, unchanged = future.result()
+        file_count += written
+        unchanged_count += unchanged
+        
+        # Print progress every PROGRESS_INTERVAL files, overwriting the previous update
+        if (file_count + unchanged_count) // PROGRESS_INTERVAL > previous_total // PROGRESS_INTERVAL:
+            sys.stdout.write(f"Progress: {file_count} files created/updated, {unchanged_count} unchanged\r")
+    return file_count, unchanged_count
+
 def create_json_files(data, base_dir="./"):
     """
     Create JSON files in the specified directory structure
     Structure: tuxcare/DISTRO/VERSION/VARIANT/YYYY/CVE-NAME.json
     For example: tuxcare/AlmaLinux/9.2/ESU/2025/CVE-2025-21785.json
     Only overwrites files if content has changed.
+    Directories are created serially, file writes are spread over a thread pool
+    in batches of WRITE_BATCH_SIZE files, with at most MAX_PENDING_BATCHES queued.
     """
     # Track created files to avoid duplicates
     created_files = set()
+    # Directories already created, keyed by (OS name, year), so the path is
+    # built and makedirs is called only once per distinct directory
+    dir_paths = {}
     file_count = 0
     unchanged_count = 0
     
-    for entry in data:
-        try:
-            cve = entry['CVE']
-            os_name = entry['OS name']
-            # Extract year from the Last updated field
-            year = entry['Last updated'][:4]
-            
-            # Parse OS name into components
-            distro, version, variant = parse_os_name(os_name)
-            
-            # Create the directory path
-            if variant:
-                dir_path = os.path.join(base_dir, "tuxcare", distro, version, variant, year)
-            else:
-                dir_path = os.path.join(base_dir, "tuxcare", distro, version, year)
+    with ThreadPoolExecutor(max_workers=WRITE_WORKERS) as executor:
+        pending = set()
+        batch = []
+        for entry in data:
+            try:
+                cve = entry['CVE']
+                os_name = entry['OS name']
+                # Extract year from the Last updated field
+                year = entry['Last updated'][:4]
                 
-            os.makedirs(dir_path, exist_ok=True)
-            
-            # Create the file path
-            file_path = os.path.join(dir_path, f"{cve}.json")
-            
-            # Skip if we've already created this file
-            if file_path in created_files:
-                continue
-            
-            # Generate new content
-            new_content = json.dumps(entry, indent=2)
-            
-            # Check if file exists and compare content
-            if os.path.exists(file_path):
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        existing_content = f.read()
+                dir_path = dir_paths.get((os_name, year))
+                if dir_path is None:
+                    # Parse OS name into components
+                    distro, version, variant = parse_os_name(os_name)
+                    
+                    # Create the directory path
+                    if variant:
+                        dir_path = os.path.join(base_dir, "tuxcare", distro, version, variant, year)
+                    else:
+                        dir_path = os.path.join(base_dir, "tuxcare", distro, version, year)
                         
-                    # Skip if content is unchanged
-                    if existing_content == new_content:
-                        created_files.add(file_path)
-                        unchanged_count += 1
-                        continue
-                except Exception as e:
-                    # If reading fails, proceed with writing the file
-                    print(f"Warning: Could not read existing file {file_path}: {e}")
-            
-            # Write the JSON file (only if new or content changed)
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(new_content)
-            
-            created_files.add(file_path)
-            file_count += 1
-            
-            # Print progress every 10 files
-            if (file_count + unchanged_count) % 10 == 0:
-                print(f"Progress: {file_count} files created/updated, {unchanged_count} unchanged")
-        except KeyError as e:
-            print(f"Warning: Missing field {e} in entry, skipping")
-            continue
-        except Exception as e:
-            print(f"Error processing entry {entry.get('CVE', 'unknown')}: {e}")
-            continue
+                    os.makedirs(dir_path, exist_ok=True)
+                    dir_paths[(os_name, year)] = dir_path
+                
+                # Create the file path
+                file_path = os.path.join(dir_path, f"{cve}.json")
+                
+                # Skip if we've already created this file
+                if file_path in created_files:
+                    continue
+                
+                # Generate new content
+                new_content = dump_entry(entry).encode('utf-8')
+                
+                batch.append((cve, file_path, new_content))
+                created_files.add(file_path)
+                if len(batch) == WRITE_BATCH_SIZE:
+                    pending.add(executor.submit(write_json_batch, batch))
+                    batch = []
+                    
+                    # Wait for writers to catch up so memory use stays bounded
+                    if len(pending) >= MAX_PENDING_BATCHES:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        file_count, unchanged_count = collect_write_batches(done, file_count, unchanged_count)
+            except KeyError as e:
+                print(f"Warning: Missing field {e} in entry, skipping")
+                continue
+            except Exception as e:
+                print(f"Error processing entry {entry.get('CVE', 'unknown')}: {e}")
+                continue
+        
+        if batch:
+            pending.add(executor.submit(write_json_batch, batch))
+        
+        file_count, unchanged_count = collect_write_batches(as_completed(pending), file_count, unchanged_count)
     
     print(f"\nCompleted: {file_count} JSON files created/updated, {unchanged_count} files unchanged")
     return file_count
@@ -181,7 +277,7 @@ def main():
     
     print(f"Processing CSV file: {args.csv_file}")
     
-    # Convert CSV to JSON
+    # Convert CSV to JSON, rows are read lazily as they are consumed
     data = convert_csv_to_json(args.csv_file)
     
     # List OS names if requested
@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
 import os
 import sys
+import json
 import requests
-import hashlib
+import filecmp
 import time
 from datetime import datetime
 
@@ -11,17 +12,55 @@ CSV_URL = "https://cve.tuxcare.com/els/download-csv"  # Replace with actual URL
 LOCAL_CSV_PATH = "tuxcare.csv"
 NEW_CSV_PATH = "tuxcare.csv.new"
 UPDATED_CSV_PATH = "tuxcare_updated.csv"
+DOWNLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+# ETag/Last-Modified of the last downloaded CSV, used for conditional requests
+VALIDATORS_PATH = ".tuxcare.csv.etag"
+
+def load_validators():
+    """Build conditional request headers from the validators of the previous download"""
+    try:
+        with open(VALIDATORS_PATH, 'r', encoding='utf-8') as f:
+            validators = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    
+    headers = {}
+    if validators.get('ETag'):
+        headers['If-None-Match'] = validators['ETag']
+    if validators.get('Last-Modified'):
+        headers['If-Modified-Since'] = validators['Last-Modified']
+    return headers
+
+def save_validators(response):
+    """Store the ETag/Last-Modified of a downloaded CSV for the next run"""
+    validators = {name: response.headers[name] for name in ('ETag', 'Last-Modified') if name in response.headers}
+    if validators:
+        with open(VALIDATORS_PATH, 'w', encoding='utf-8') as f:
+            json.dump(validators, f, indent=2)
+            f.write('\n')
 
 def download_csv():
-    """Download the CSV file from the TuxCare website"""
+    """
+    Download the CSV file from the TuxCare website
+    Nothing is downloaded if the server reports the CSV unchanged since the last run.
+    """
     try:
         print(f"Downloading CSV from {CSV_URL}...")
-        response = requests.get(CSV_URL, timeout=60)
-        response.raise_for_status()
-        
-        # Save to a new file
-        with open(NEW_CSV_PATH, 'wb') as f:
-            f.write(response.content)
+        with requests.get(CSV_URL, headers=load_validators(), stream=True, timeout=60) as response:
+            if response.status_code == 304:
+                print("CSV not modified since the last download")
+                # Make sure a leftover file from an interrupted run is not mistaken for a new download
+                if os.path.exists(NEW_CSV_PATH):
+                    os.remove(NEW_CSV_PATH)
+                return True
+            response.raise_for_status()
+            
+            # Stream to a new file instead of holding the whole CSV in memory
+            with open(NEW_CSV_PATH, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+            
+            save_validators(response)
         
         print(f"CSV downloaded successfully to {NEW_CSV_PATH}")
         return True
@@ -31,18 +70,17 @@ def download_csv():
 
 def check_for_changes():
     """Check if the downloaded CSV is different from the existing one"""
+    if not os.path.exists(NEW_CSV_PATH):
+        print("No new CSV was downloaded, nothing to compare")
+        return False
+    
     if not os.path.exists(LOCAL_CSV_PATH):
         print(f"No existing CSV found at {LOCAL_CSV_PATH}, will use the new one")
         os.rename(NEW_CSV_PATH, UPDATED_CSV_PATH)
         return True
     
-    with open(LOCAL_CSV_PATH, 'rb') as f:
-        old_hash = hashlib.sha256(f.read()).hexdigest()
-    
-    with open(NEW_CSV_PATH, 'rb') as f:
-        new_hash = hashlib.sha256(f.read()).hexdigest()
-    
-    if old_hash != new_hash:
+    # Byte-by-byte comparison, stops at the first difference (or size mismatch)
+    if not filecmp.cmp(LOCAL_CSV_PATH, NEW_CSV_PATH, shallow=False):
         print("CSV has changed, will update the data")
         os.rename(NEW_CSV_PATH, UPDATED_CSV_PATH)
         return True